@@ -2,50 +2,110 @@
 """Discord bots that use OpenAI's API to generate responses."""
 
 import asyncio
-import json
 import os
 import random
+import re
 import sys
 import time
 import logging
+import logging.handlers
+import queue
+from collections import Counter, deque
 from datetime import datetime
 import discord
+import httpx
+import orjson
 from discord.ext import commands
-from openai import AsyncOpenAI
+from openai import APIConnectionError, APIStatusError, AsyncOpenAI, DefaultAsyncHttpxClient
+
+class TokenBucketRateLimiter:
+    """Async token bucket that refills max_tokens tokens every refill_interval seconds."""
+
+    def __init__(self, max_tokens, refill_interval):
+        self.max_tokens = max_tokens
+        self.refill_interval = refill_interval
+        self.tokens = max_tokens
+        self.last_refill = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    def refill(self):
+        now = time.monotonic()
+        if now <= self.last_refill:
+            return  # Paused, see pause()
+        elapsed = now - self.last_refill
+        self.tokens = min(self.max_tokens, self.tokens + elapsed * self.max_tokens / self.refill_interval)
+        self.last_refill = now
+
+    async def acquire(self):
+        async with self.lock:
+            self.refill()
+            while self.tokens < 1:
+                await asyncio.sleep(self.time_until_token())
+                self.refill()
+            self.tokens -= 1
+
+    def time_until_token(self):
+        paused_for = max(0.0, self.last_refill - time.monotonic())
+        return paused_for + (1 - self.tokens) * self.refill_interval / self.max_tokens
+
+    def pause(self, seconds):
+        """Drain the bucket and stop refilling for the given number of seconds."""
+        self.tokens = 0
+        self.last_refill = max(self.last_refill, time.monotonic() + seconds)
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+# Shared by all bots: bursts of 5 requests, 60 requests per minute sustained
+openai_limiter = TokenBucketRateLimiter(max_tokens=5, refill_interval=5.0)
+RATE_LIMIT_REMAINING_THRESHOLD = 2
+
+def parse_reset_duration(value):
+    """Parse OpenAI reset headers such as "1s", "20ms" or "6m0s" into seconds, or None."""
+    parts = re.findall(r'(\d+(?:\.\d+)?)(ms|h|m|s)', value or '')
+    if not parts:
+        return None
+    units = {'h': 3600, 'm': 60, 's': 1, 'ms': 0.001}
+    return sum(float(amount) * units[unit] for amount, unit in parts)
 
 class Message:
+    __slots__ = ("author", "author_id", "message", "stripped_message", "message_id", "message_id_str",
+                 "replying_to", "replying_to_replying_to", "weight", "_static_dict")
+
     def __init__(self, author, content, message_id, replying_to=None):
-        print("Creating")
         self.author = author
         self.author_id = author.id
         self.message = content
+        self.stripped_message = content.strip()
         self.message_id = message_id
+        self.message_id_str = str(message_id)
         self.replying_to = replying_to.author if replying_to else None
         self.replying_to_replying_to = replying_to.reference.resolved.content if replying_to is not None and replying_to.reference is not None and replying_to.reference.resolved is not None else None
-        self.weight = self.calculate_base_weight()
-        print("Created.")
-
-    def calculate_base_weight(self):
-        base_weight = 0.5 if self.author.bot else 1.0
-        if self.replying_to and not self.replying_to.bot:
-            base_weight *= 1.2  # Increase weight for replies to actual users
-        return base_weight
-
-    def to_dict(self):
-        return {
-            "author": str(self.author),
+        weight = 0.5 if author.bot else 1.0
+        if self.replying_to is not None and not self.replying_to.bot:
+            weight *= 1.2  # Increase weight for replies to actual users
+        self.weight = weight
+        # Everything but the weight is fixed once the message is created
+        self._static_dict = {
+            "author": str(author),
             "author_id": str(self.author_id),
             "message": self.message,
             "message_id": self.message_id,
-            "replying_to": str(self.replying_to.id) if self.replying_to else None,
-            "replying_to_replying_to": self.replying_to_replying_to,
-            "weight": self.weight
+            "replying_to": str(self.replying_to.id) if self.replying_to is not None else None,
+            "replying_to_replying_to": self.replying_to_replying_to
         }
 
+    def to_dict(self):
+        return {**self._static_dict, "weight": self.weight}
+
 class GPTBot:
     all_bots = []
 
-    def __init__(self, config):
+    def __init__(self, config, aclient=None):
         # Setup logging
         self.setup_logging(config['name'], config.get('log_color', 'white'))
         self.logger.info(f"Initializing {config['name']} bot")
@@ -56,24 +116,35 @@ class GPTBot:
         self.model_name = config['name']
         
         # Load system prompt from file
-        with open(config['prompt_file'], 'r') as f:
-            self.system_prompt = f.read()
+        self.prompt_file = config['prompt_file']
+        self.prompt_mtime = None
+        self.load_prompt()
         
         # Initialize variables
-        self.message_array = []
         self.MESSAGE_MEMORY = 10
+        self.message_array = deque(maxlen=self.MESSAGE_MEMORY)
+        self.messages_by_id = {}  # message_id_str -> Message, mirrors message_array
+        self.stripped_messages = Counter()  # stripped content -> occurrences in message_array
         self.DEBUG = False
         self.DELAY_MIN = 15
         self.DELAY_MAX = 25
+        self.delay_multiplier = 1.0  # Scales the active delay range, see adjust_delay
+        self.MAX_DELAY_MULTIPLIER = 8.0
+        self.TARGET_LATENCY = 5.0
         self.time_remaining = 0
+        self.STATUS_UPDATE_INTERVAL = 10  # Discord rate limits presence updates
         self.NIGHT_MODE_ENABLED = True
         self.NIGHT_DELAY_MIN = 40
         self.NIGHT_DELAY_MAX = 60
-        self.bot_mention_pattern = None  # Will be set in on_ready
+        self.MAX_REGENERATIONS = 3
         
         # Setup bot and client
-        self.aclient = AsyncOpenAI(api_key=config['openai_key'])
-        intents = discord.Intents.default()
+        self.aclient = aclient or AsyncOpenAI(api_key=config['openai_key'])
+        # Only subscribe to the gateway events the bot handles; each persona has its own
+        # account, so every extra intent is duplicated traffic per bot
+        intents = discord.Intents.none()
+        intents.guilds = True
+        intents.guild_messages = True
         intents.message_content = True
         self.bot = commands.Bot(command_prefix='#', intents=intents)
         
@@ -100,12 +171,27 @@ class GPTBot:
         log_file = f'logs/{bot_name}_{datetime.now().strftime("%Y%m%d")}.log'
         file_handler = logging.FileHandler(log_file)
         file_handler.setFormatter(formatter)
-        self.logger.addHandler(file_handler)
         
         # Console handler with color
         console_handler = logging.StreamHandler()
         console_handler.setFormatter(logging.Formatter(f'\033[{self.get_color_code(log_color)}m%(asctime)s - {bot_name} - %(levelname)s - %(message)s\033[0m'))
-        self.logger.addHandler(console_handler)
+        
+        # Records are prepared on the calling thread and enqueued; a background thread
+        # runs the file and console handlers, so their formatting and I/O stay off the event loop
+        log_queue = queue.Queue(-1)
+        self.logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        self.log_listener = logging.handlers.QueueListener(log_queue, file_handler, console_handler)
+        self.log_listener.start()
+
+    def load_prompt(self):
+        """Read the system prompt file if it changed since the last load. Returns True if it was read."""
+        mtime = os.stat(self.prompt_file).st_mtime
+        if mtime == self.prompt_mtime:
+            return False
+        with open(self.prompt_file, 'r') as f:
+            self.system_prompt = f.read()
+        self.prompt_mtime = mtime
+        return True
 
     def get_color_code(self, color_name):
         colors = {
@@ -128,9 +214,10 @@ class GPTBot:
                 channel = self.bot.get_channel(self.channel_id)
                 await asyncio.wait_for(self.update_message_history(channel), timeout=20)
                 await self.update_status()
-                self.logger.info(f"Initial messages loaded: {self.message_array}")
+                self.logger.info(f"Initial messages loaded: {len(self.message_array)}")
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug(f"Initial messages: {[msg.to_dict() for msg in self.message_array]}")
                 self.bot.loop.create_task(self.send_responses(channel))
-                self.bot_mention_pattern = f'<@{self.bot.user.id}>'
             except Exception as e:
                 self.logger.error(f"Error in on_ready: {e}")
 
@@ -141,13 +228,20 @@ class GPTBot:
                     msg = Message(message.author, message.content, message.id,
                                   message.reference.resolved if message.reference else None)
                     
-                    # Adjust weight for bot mentions
-                    if self.bot_mention_pattern and self.bot_mention_pattern in message.content:
+                    # Adjust weight for explicit bot mentions in the content (<@id> or <@!id>)
+                    if self.bot.user.id in message.raw_mentions:
                         msg.weight *= 1.4
                     
-                    if len(self.message_array) >= self.MESSAGE_MEMORY:
-                        self.message_array.pop(0)
+                    # The deque drops its oldest entry on append once full
+                    if len(self.message_array) == self.message_array.maxlen:
+                        evicted = self.message_array[0]
+                        self.messages_by_id.pop(evicted.message_id_str, None)
+                        self.stripped_messages[evicted.stripped_message] -= 1
+                        if self.stripped_messages[evicted.stripped_message] <= 0:
+                            del self.stripped_messages[evicted.stripped_message]
                     self.message_array.append(msg)
+                    self.messages_by_id[msg.message_id_str] = msg
+                    self.stripped_messages[msg.stripped_message] += 1
                 await self.bot.process_commands(message)
             except Exception as e:
                 self.logger.error(f"Error in on_message: {e}")
@@ -155,7 +249,9 @@ class GPTBot:
         @self.bot.command(name='reset_history')
         async def reset_history(ctx):
             try:
-                self.message_array = []
+                self.message_array = deque(maxlen=self.MESSAGE_MEMORY)
+                self.messages_by_id = {}
+                self.stripped_messages = Counter()
                 await ctx.send("#Message history has been reset.")
                 self.logger.info("Message history reset")
             except Exception as e:
@@ -169,7 +265,22 @@ class GPTBot:
                     self.logger.warning(f"Invalid memory size attempted: {size}")
                     return
                 self.MESSAGE_MEMORY = size
-                await self.update_message_history(ctx.channel)
+                if size <= len(self.message_array):
+                    # Keep the newest messages, nothing to fetch
+                    self.message_array = deque(self.message_array, maxlen=size)
+                    self.rebuild_message_indexes()
+                elif self.message_array:
+                    # Only fetch the older messages that don't fit in the current history yet.
+                    # Grow the live deque first so on_message doesn't evict while we wait, and
+                    # fetch into a separate deque: the history may change during the await.
+                    self.message_array = deque(self.message_array, maxlen=size)
+                    oldest = discord.Object(id=self.message_array[0].message_id)
+                    older = deque()
+                    await self.fetch_history(ctx.channel, older, size - len(self.message_array), before=oldest)
+                    self.message_array = deque([*older, *self.message_array], maxlen=self.MESSAGE_MEMORY)
+                    self.rebuild_message_indexes()
+                else:
+                    await self.update_message_history(ctx.channel)
                 await ctx.send(f"#Message memory size set to {size}")
                 self.logger.info(f"Memory size changed to {size}")
             except Exception as e:
@@ -183,7 +294,7 @@ class GPTBot:
                     return
                 self.DEBUG = value.lower() == 'true'
                 await ctx.send(f"#Debug mode set to {self.DEBUG}")
-                print(f"Debug mode set to {self.DEBUG}")
+                self.logger.info(f"Debug mode set to {self.DEBUG}")
             except Exception as e:
                 self.logger.error(f"Error in set_debug: {e}")
 
@@ -197,7 +308,7 @@ class GPTBot:
                 self.DELAY_MAX = max_delay
                 await self.update_status()
                 await ctx.send(f"#Delay range set to {self.DELAY_MIN}-{self.DELAY_MAX} seconds")
-                print(f"Delay range changed to {self.DELAY_MIN}-{self.DELAY_MAX}")
+                self.logger.info(f"Delay range changed to {self.DELAY_MIN}-{self.DELAY_MAX}")
             except Exception as e:
                 self.logger.error(f"Error in set_delay: {e}")
 
@@ -209,17 +320,19 @@ class GPTBot:
                     return
                 self.NIGHT_MODE_ENABLED = value.lower() == 'true'
                 await ctx.send(f"#Night mode set to {self.NIGHT_MODE_ENABLED}")
-                print(f"Night mode set to {self.NIGHT_MODE_ENABLED}")
+                self.logger.info(f"Night mode set to {self.NIGHT_MODE_ENABLED}")
             except Exception as e:
                 self.logger.error(f"Error in set_night_mode: {e}")
 
         @self.bot.command(name='refresh_prompt')
         async def refresh_prompt(ctx):
             try:
-                with open(self.config['prompt_file'], 'r') as f:
-                    self.system_prompt = f.read()
+                # Read off the event loop so the other bots keep running
+                if await asyncio.to_thread(self.load_prompt):
+                    self.logger.info("System prompt refreshed")
+                else:
+                    self.logger.info("System prompt unchanged, skipped reload")
                 await ctx.send("#System prompt has been refreshed.")
-                self.logger.info("System prompt refreshed")
             except Exception as e:
                 self.logger.error(f"Error in refresh_prompt: {e}")
 
@@ -241,98 +354,130 @@ class GPTBot:
             await ctx.send(help_text)
 
     def prepare_messages_for_ai(self):
-        messages = []
-        for idx, msg in enumerate(self.message_array):
-            weight_multiplier = 1.0
-            if msg.author == self.bot.user:
-                weight_multiplier = 0.0
-            elif idx == len(self.message_array) - 1:  # Newest message
-                weight_multiplier = 0.8
-            elif idx == len(self.message_array) - 2:
-                weight_multiplier = 0.7
-            elif idx == len(self.message_array) - 3:
-                weight_multiplier = 0.6
-            elif idx == len(self.message_array) - 4:
-                weight_multiplier = 0.5
-            else:
-                weight_multiplier = 0.4
-            
-            msg_dict = msg.to_dict()
-            msg_dict['weight'] *= weight_multiplier
-            messages.append(msg_dict)
-        
-        return json.dumps(messages, ensure_ascii=False)
+        n = len(self.message_array)
+        # Oldest messages get 0.4, the four newest 0.5 through 0.8
+        multipliers = (0.4,) * (n - 4) + (0.5, 0.6, 0.7, 0.8)[-n:]
+        bot_user_id = self.bot.user.id
+        messages = [
+            {**msg._static_dict, "weight": 0.0 if msg.author_id == bot_user_id else msg.weight * multiplier}
+            for msg, multiplier in zip(self.message_array, multipliers)
+        ]
+        return orjson.dumps(messages).decode()
 
     async def get_ai_response(self, messages):
         try:
             context = self.prepare_messages_for_ai()
             self.logger.info(f"Generating response for context: {context}")
-            response = await self.aclient.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": self.system_prompt},
-                    {"role": "user", "content": context}
-                ],
-                presence_penalty=1.5,
-                temperature=0.8,
-                max_tokens=256,
-                response_format={ "type": "json_object" }
-            )
-            response_json = response.choices[0].message.content
-            response_data = json.loads(response_json)
-            generated_response = response_data.get("response", "")
-            picked_message_id = response_data.get("picked_message", None)
-            if picked_message_id:
-                picked_message = next((msg for msg in self.message_array if str(msg.message_id) == str(picked_message_id)), None)
-                if picked_message:
-                    picked_message.weight *= 0.5  # Set weight to half after being responded to
-                    self.logger.info(f"Generated response: {generated_response}")
-                    self.logger.info(f"Picked message: {picked_message.message}")
-                    if generated_response.strip() == picked_message.message.strip() or any(generated_response.strip() == msg.message.strip() for msg in self.message_array):
-                        self.logger.warning("Generated response is the same as the picked message or already exists in message history. Regenerating response.")
-                        return await self.get_ai_response(messages)  # Regenerate response
+            for attempt in range(self.MAX_REGENERATIONS):
+                if attempt:
+                    await asyncio.sleep(2 ** attempt * 0.25)
+                async with openai_limiter:
+                    request_start = time.monotonic()
+                    raw_response = await self.aclient.chat.completions.with_raw_response.create(
+                        model=self.model,
+                        messages=[
+                            {"role": "system", "content": self.system_prompt},
+                            {"role": "user", "content": context}
+                        ],
+                        presence_penalty=1.5,
+                        temperature=0.8,
+                        max_tokens=256,
+                        response_format={ "type": "json_object" }
+                    )
+                self.adjust_delay(True, time.monotonic() - request_start)
+                response = raw_response.parse()
+                self.respect_rate_limit_headers(raw_response.headers)
+                response_json = response.choices[0].message.content
+                response_data = orjson.loads(response_json)
+                generated_response = response_data.get("response", "")
+                picked_message_id = response_data.get("picked_message", None)
+                if picked_message_id:
+                    picked_message = self.messages_by_id.get(str(picked_message_id))
+                    if picked_message:
+                        picked_message.weight *= 0.5  # Set weight to half after being responded to
+                        self.logger.info(f"Generated response: {generated_response}")
+                        self.logger.info(f"Picked message: {picked_message.message}")
+                        # The picked message is part of the history, so one lookup covers both cases
+                        if generated_response.strip() in self.stripped_messages:
+                            self.logger.warning("Generated response is the same as the picked message or already exists in message history. Regenerating response.")
+                            continue
+                    else:
+                        self.logger.warning(f"Picked message ID {picked_message_id} not found in message array.")
                 else:
-                    self.logger.warning(f"Picked message ID {picked_message_id} not found in message array.")
-            else:
-                self.logger.warning("No message picked.")
-            return {"response": generated_response, "picked_message": picked_message_id}
+                    self.logger.warning("No message picked.")
+                return {"response": generated_response, "picked_message": picked_message_id}
+            self.logger.warning(f"No new response after {self.MAX_REGENERATIONS} attempts, staying silent.")
+            return {"response": "", "picked_message": None}
         except Exception as e:
             err = f"OpenAI API Error: {e}"
+            # Only back off on congestion (timeouts, connection errors, 429s and 5xx), not on malformed replies
+            if isinstance(e, APIConnectionError) or (isinstance(e, APIStatusError) and (e.status_code == 429 or e.status_code >= 500)):
+                self.adjust_delay(False)
             self.logger.error(err)
             return {"response": "", "picked_message": err}
 
+    def adjust_delay(self, succeeded, latency=None):
+        """AIMD: shrink the delay multiplier slowly after fast successes, double it when the API is congested."""
+        if succeeded:
+            if latency is not None and latency < self.TARGET_LATENCY:
+                self.delay_multiplier = max(1.0, self.delay_multiplier - 0.25)
+        else:
+            self.delay_multiplier = min(self.MAX_DELAY_MULTIPLIER, self.delay_multiplier * 2)
+            self.logger.info(f"API congested, delay multiplier raised to {self.delay_multiplier}x")
+
+    def respect_rate_limit_headers(self, headers):
+        """Pause the shared limiter until the quota resets when OpenAI reports it is almost used up."""
+        remaining = headers.get('x-ratelimit-remaining-requests')
+        if remaining is None or not remaining.isdigit() or int(remaining) >= RATE_LIMIT_REMAINING_THRESHOLD:
+            return
+        wait = parse_reset_duration(headers.get('x-ratelimit-reset-requests'))
+        if wait is None:
+            wait = 1.0
+        self.logger.warning(f"Only {remaining} OpenAI requests left, pausing all bots for {wait}s")
+        openai_limiter.pause(wait)
+
     async def update_status(self):
-        activity = discord.Game(f"{self.model_name} | Next: {self.time_remaining}s")
+        activity = discord.Game(f"{self.model_name} | Next: {int(self.time_remaining)}s")
         await self.bot.change_presence(activity=activity)
 
     async def countdown_status(self, total_seconds):
         self.time_remaining = total_seconds
         while self.time_remaining > 0:
             await self.update_status()
-            await asyncio.sleep(3)
-            self.time_remaining = max(0, self.time_remaining - 3)
+            step = min(self.STATUS_UPDATE_INTERVAL, self.time_remaining)
+            await asyncio.sleep(step)
+            self.time_remaining = max(0, self.time_remaining - step)
         await self.update_status()
 
+    def rebuild_message_indexes(self):
+        self.messages_by_id = {msg.message_id_str: msg for msg in self.message_array}
+        self.stripped_messages = Counter(msg.stripped_message for msg in self.message_array)
+
+    async def fetch_history(self, channel, messages, limit, before=None):
+        """Prepend up to limit channel messages older than before to the messages deque."""
+        # History arrives newest first; appendleft leaves the deque oldest first
+        async for message in channel.history(limit=limit, before=before):
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"Checking message {message.id}")
+            if message.content and message.content[0] != '#' and message.author.id != self.bot.user.id:
+                author = message.author
+                content = message.content
+                message_id = message.id
+                replying_to = message.reference.resolved if message.reference and message.reference.resolved else None
+                msg = Message(author, content, message_id, replying_to)
+                messages.appendleft(msg)
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug(f"Fetched message: {msg.to_dict()}")
+                self.logger.debug("Moving on to next message")
+
     async def update_message_history(self, channel):
         try:
-            messages = []
+            messages = deque(maxlen=self.MESSAGE_MEMORY)
             self.logger.info(f"Fetching message history for channel: {channel.id}")
-            async for message in channel.history(limit=self.MESSAGE_MEMORY):
-                self.logger.info(f"Checking message {message.id}")
-                if message.content[0] != '#' and message.author != self.bot.user:
-                    self.logger.info(f"Adding message: {message.content}")
-                    author = message.author
-                    content = message.content
-                    message_id = message.id
-                    replying_to = message.reference.resolved if message.reference and message.reference.resolved else None
-                    msg = Message(author, content, message_id, replying_to)
-                    self.logger.info(f"Adding message: {msg.to_dict()}")
-                    messages.append(msg)
-                    self.logger.info(f"Fetched message: {msg.to_dict()}")
-                    self.logger.info(f"Moving on to next message")
+            await self.fetch_history(channel, messages, self.MESSAGE_MEMORY)
             self.logger.info("Done fetching messages")
             self.message_array = messages
-            self.message_array.reverse()
+            self.rebuild_message_indexes()
             self.logger.info(f"Message history updated. Total messages: {len(self.message_array)}")
         except Exception as e:
             self.logger.error(f"Error in update_message_history: {e}")
@@ -345,7 +490,7 @@ class GPTBot:
                 picked_message_id = ai_response_json["picked_message"]
                 if ai_response and ai_response.strip() not in ["*SILENCE*", "*END OF CONVERSATION*", "", "\n"]:
                     if picked_message_id:
-                        picked_message = next((msg for msg in self.message_array if str(msg.message_id) == str(picked_message_id)), None)
+                        picked_message = self.messages_by_id.get(str(picked_message_id))
                         if picked_message:
                             picked_message.weight *= 0.3  # Lower the weight
                             self.logger.info(f"Picked message: {picked_message.message}")
@@ -358,17 +503,17 @@ class GPTBot:
                         await channel.send(ai_response)
                     self.logger.info(f"Sent response: {ai_response}")
                     if self.DEBUG:
-                        debug_context = json.dumps([msg.to_dict() for msg in self.message_array], ensure_ascii=False)
+                        debug_context = orjson.dumps([msg.to_dict() for msg in self.message_array]).decode()
                         debug_msg = f"#[DEBUG - MESSAGE CONTEXT]\n{debug_context}"
                         await channel.send(debug_msg)
                         self.logger.info(f"Debug context: {debug_context}")
                 
                 if self.NIGHT_MODE_ENABLED and self.is_night_time():
-                    delay = random.randint(self.NIGHT_DELAY_MIN, self.NIGHT_DELAY_MAX)
-                    self.logger.info(f"Night mode active, delay: {delay}s")
+                    delay = random.uniform(self.NIGHT_DELAY_MIN, self.NIGHT_DELAY_MAX) * self.delay_multiplier
+                    self.logger.info(f"Night mode active, delay: {delay:.1f}s")
                 else:
-                    delay = random.randint(self.DELAY_MIN, self.DELAY_MAX)
-                    self.logger.info(f"Normal mode, delay: {delay}s")
+                    delay = random.uniform(self.DELAY_MIN, self.DELAY_MAX) * self.delay_multiplier
+                    self.logger.info(f"Normal mode, delay: {delay:.1f}s")
                 
                 await self.countdown_status(delay)
             except Exception as e:
@@ -383,18 +528,29 @@ class GPTBot:
 
 async def main():
     # Load config
-    with open('config.json', 'r') as f:
-        config = json.load(f)
-    
-    # Create bot instances
-    v3s_bot = GPTBot({**config['bots']['v3s'], 'openai_key': config['openai_key']})
-    sarvel_bot = GPTBot({**config['bots']['sarvel'], 'openai_key': config['openai_key']})
+    with open('config.json', 'rb') as f:
+        config = orjson.loads(f.read())
     
-    # Run both bots concurrently
-    await asyncio.gather(
-        v3s_bot.run(),
-        sarvel_bot.run()
+    # Both bots use the same key, so share one client and connection pool
+    shared_client = AsyncOpenAI(
+        api_key=config['openai_key'],
+        http_client=DefaultAsyncHttpxClient(limits=httpx.Limits(max_connections=64, max_keepalive_connections=32))
     )
+    
+    try:
+        # Create bot instances
+        v3s_bot = GPTBot({**config['bots']['v3s'], 'openai_key': config['openai_key']}, shared_client)
+        sarvel_bot = GPTBot({**config['bots']['sarvel'], 'openai_key': config['openai_key']}, shared_client)
+        
+        # Run both bots concurrently
+        await asyncio.gather(
+            v3s_bot.run(),
+            sarvel_bot.run()
+        )
+    finally:
+        await shared_client.close()
+        for bot in GPTBot.all_bots:
+            bot.log_listener.stop()
 
 if __name__ == "__main__":
     asyncio.run(main())